@@ -1,54 +1,97 @@
 """API key authentication and rate limiting."""
 
-from fastapi import HTTPException, Security, status
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import APIKeyHeader
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Tuple
 import asyncio
+import itertools
+import time
 
 from config import settings
 
-# API key header
+# API key header (declared on the routers so it shows up in the OpenAPI docs;
+# enforcement happens in AuthRateLimitMiddleware)
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
-# Rate limiting storage: {api_key: [(timestamp1, timestamp2, ...)]}
-_rate_limit_store: Dict[str, list] = defaultdict(list)
-_rate_limit_lock = asyncio.Lock()
-
-
-async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
-    """
-    Verify that the provided API key is valid.
-
-    Args:
-        api_key: The API key from the X-API-Key header
-
-    Returns:
-        The validated API key
-
-    Raises:
-        HTTPException: 401 if key is missing, 403 if invalid
-    """
-    if not api_key:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing API key. Include X-API-Key header.",
-            headers={"WWW-Authenticate": "ApiKey"},
-        )
-
-    valid_keys = settings.api_keys_list
-
-    if api_key not in valid_keys:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid API key",
-        )
-
-    return api_key
-
-
-async def check_rate_limit(api_key: str) -> Tuple[int, int, datetime]:
+# Authentication failures don't depend on the request, so the responses are
+# built once and sent as-is
+_MISSING_KEY_RESPONSE = ORJSONResponse(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    content={"detail": "Missing API key. Include X-API-Key header."},
+    headers={"WWW-Authenticate": "ApiKey"},
+)
+_INVALID_KEY_RESPONSE = ORJSONResponse(
+    status_code=status.HTTP_403_FORBIDDEN,
+    content={"detail": "Invalid API key"},
+)
+
+# Sliding window: 6 buckets of 10 seconds cover the one-minute window
+_BUCKET_SECONDS = 10.0
+_BUCKET_COUNT = 6
+
+
+class _SlidingWindow:
+    """Request counts for one API key, grouped into fixed time buckets."""
+
+    __slots__ = ("buckets", "slot")
+
+    def __init__(self):
+        self.buckets = [0] * _BUCKET_COUNT
+        self.slot = 0  # Absolute index of the newest bucket
+
+    def advance(self, slot: int) -> None:
+        """
+        Move the window forward, zeroing buckets that have expired.
+
+        Args:
+            slot: Absolute bucket index for the current time
+        """
+        if slot - self.slot >= _BUCKET_COUNT:
+            self.buckets = [0] * _BUCKET_COUNT
+        else:
+            for expired in range(self.slot + 1, slot + 1):
+                self.buckets[expired % _BUCKET_COUNT] = 0
+        self.slot = slot
+
+    def reset_at(self) -> float:
+        """
+        Time (monotonic seconds) at which the oldest counted requests expire.
+
+        That is when the window next frees capacity. Assumes the window has
+        been advanced to the current slot.
+
+        Returns:
+            Expiry time of the oldest non-empty bucket
+        """
+        oldest = self.slot - _BUCKET_COUNT + 1
+        while oldest < self.slot and not self.buckets[oldest % _BUCKET_COUNT]:
+            oldest += 1
+        return (oldest + _BUCKET_COUNT) * _BUCKET_SECONDS
+
+
+# Offset to convert time.monotonic() readings into Unix timestamps
+_WALL_OFFSET = time.time() - time.monotonic()
+
+# Pre-encoded rate limit header names and the (static) limit value
+_LIMIT_HEADER = (b"x-ratelimit-limit", str(settings.rate_limit_per_minute).encode())
+_REMAINING_HEADER_NAME = b"x-ratelimit-remaining"
+_RESET_HEADER_NAME = b"x-ratelimit-reset"
+
+# Rate limiting storage, sharded by key hash so cleanup can process one
+# shard at a time: [{api_key: _SlidingWindow}, ...]
+# No lock is needed: the check-and-update below contains no await, so it
+# runs atomically on the event loop.
+_SHARD_COUNT = 16  # Must be a power of two
+_rate_limit_shards: List[Dict[str, _SlidingWindow]] = [
+    defaultdict(_SlidingWindow) for _ in range(_SHARD_COUNT)
+]
+
+
+def check_rate_limit(api_key: str) -> List[Tuple[bytes, bytes]]:
     """
     Check if the API key has exceeded rate limits.
 
@@ -56,100 +99,123 @@ async def check_rate_limit(api_key: str) -> Tuple[int, int, datetime]:
         api_key: The validated API key
 
     Returns:
-        Tuple of (remaining_requests, limit, reset_time)
+        Raw (name, value) rate limit headers for the response
 
     Raises:
         HTTPException: 429 if rate limit exceeded
     """
-    async with _rate_limit_lock:
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=1)
-
-        # Get request timestamps for this key
-        timestamps = _rate_limit_store[api_key]
-
-        # Remove old timestamps outside the current window
-        timestamps[:] = [ts for ts in timestamps if ts > window_start]
-
-        # Check if limit exceeded
-        current_count = len(timestamps)
-        limit = settings.rate_limit_per_minute
-
-        if current_count >= limit:
-            # Calculate when the oldest request will expire
-            oldest_request = min(timestamps)
-            reset_time = oldest_request + timedelta(minutes=1)
-            seconds_until_reset = int((reset_time - now).total_seconds())
-
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Try again in {seconds_until_reset} seconds.",
-                headers={
-                    "X-RateLimit-Limit": str(limit),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(reset_time.timestamp())),
-                    "Retry-After": str(seconds_until_reset),
-                },
-            )
+    now = time.monotonic()
+    slot = int(now // _BUCKET_SECONDS)
 
-        # Add current request timestamp
-        timestamps.append(now)
+    # Get the request window for this key and drop expired buckets
+    window = _rate_limit_shards[hash(api_key) & (_SHARD_COUNT - 1)][api_key]
+    window.advance(slot)
 
-        # Calculate remaining requests and reset time
-        remaining = limit - len(timestamps)
-        reset_time = now + timedelta(minutes=1)
+    # Check if limit exceeded
+    current_count = sum(window.buckets)
+    limit = settings.rate_limit_per_minute
 
-        return remaining, limit, reset_time
+    if current_count >= limit:
+        # The oldest non-empty bucket is the first to expire
+        reset_at = window.reset_at()
+        reset_epoch = int(reset_at + _WALL_OFFSET)
+        seconds_until_reset = int(reset_at - now)
 
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded. Try again in {seconds_until_reset} seconds.",
+            headers={
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(reset_epoch),
+                "Retry-After": str(seconds_until_reset),
+            },
+        )
 
-async def verify_api_key_with_rate_limit(
-    api_key: str = Security(api_key_header),
-) -> Tuple[str, Dict[str, str]]:
-    """
-    Verify API key and check rate limits in one step.
+    # Count the current request
+    window.buckets[slot % _BUCKET_COUNT] += 1
 
-    Args:
-        api_key: The API key from the X-API-Key header
+    # Calculate remaining requests and reset time (Unix timestamp), using the
+    # same oldest-bucket expiry as the 429 response
+    remaining = limit - current_count - 1
+    reset_epoch = int(window.reset_at() + _WALL_OFFSET)
 
-    Returns:
-        Tuple of (api_key, rate_limit_headers)
+    return [
+        _LIMIT_HEADER,
+        (_REMAINING_HEADER_NAME, str(remaining).encode()),
+        (_RESET_HEADER_NAME, str(reset_epoch).encode()),
+    ]
 
-    Raises:
-        HTTPException: For auth or rate limit violations
+
+class AuthRateLimitMiddleware:
+    """
+    ASGI middleware that verifies the API key and applies rate limits.
+
+    Runs before routing for every request to a protected route, so endpoints
+    don't need an auth dependency. Other paths (including unknown ones, which
+    get a 404 from the router) pass through untouched. Rate limit headers are
+    added to successful responses.
     """
-    # Verify the API key is valid
-    validated_key = await verify_api_key(api_key)
 
-    # Check rate limits
-    remaining, limit, reset_time = await check_rate_limit(validated_key)
+    def __init__(self, app: ASGIApp, protected_paths: Iterable[str]):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            protected_paths: Exact paths of the routes that require an API key
+        """
+        self.app = app
+        self.protected_paths = frozenset(protected_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.protected_paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Reject unauthenticated traffic before doing any other work
+        api_key = Headers(scope=scope).get("x-api-key")
+        if not api_key:
+            await _MISSING_KEY_RESPONSE(scope, receive, send)
+            return
+        if api_key not in settings.api_keys_set:
+            await _INVALID_KEY_RESPONSE(scope, receive, send)
+            return
+
+        try:
+            rate_limit_headers = check_rate_limit(api_key)
+        except HTTPException as e:
+            response = ORJSONResponse(
+                status_code=e.status_code,
+                content={"detail": e.detail},
+                headers=e.headers,
+            )
+            await response(scope, receive, send)
+            return
 
-    # Prepare rate limit headers
-    headers = {
-        "X-RateLimit-Limit": str(limit),
-        "X-RateLimit-Remaining": str(remaining),
-        "X-RateLimit-Reset": str(int(reset_time.timestamp())),
-    }
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *rate_limit_headers]
+            await send(message)
 
-    return validated_key, headers
+        await self.app(scope, receive, send_with_rate_limit_headers)
 
 
 async def cleanup_old_rate_limit_data():
     """
     Periodic cleanup task to remove old rate limit data.
     Should be run as a background task.
-    """
-    while True:
-        await asyncio.sleep(300)  # Run every 5 minutes
 
-        async with _rate_limit_lock:
-            now = datetime.utcnow()
-            cutoff = now - timedelta(minutes=5)
+    Shards are visited round-robin, one per tick, so every shard is cleaned
+    every 5 minutes without a single pass over all keys.
+    """
+    for shard in itertools.cycle(_rate_limit_shards):
+        await asyncio.sleep(300 / _SHARD_COUNT)
 
-            # Clean up old entries
-            for key in list(_rate_limit_store.keys()):
-                timestamps = _rate_limit_store[key]
-                timestamps[:] = [ts for ts in timestamps if ts > cutoff]
+        cutoff = int(time.monotonic() // _BUCKET_SECONDS) - _BUCKET_COUNT
 
-                # Remove empty entries
-                if not timestamps:
-                    del _rate_limit_store[key]
+        # Remove keys whose whole window has expired
+        # (iterate over a snapshot, no lock needed)
+        for key, window in list(shard.items()):
+            if window.slot <= cutoff:
+                del shard[key]
@@ -1,7 +1,8 @@
 """Configuration management using Pydantic settings."""
 
 from pydantic_settings import BaseSettings
-from typing import List
+from functools import cached_property
+from typing import FrozenSet
 
 
 class Settings(BaseSettings):
@@ -20,22 +21,31 @@ class Settings(BaseSettings):
     max_results: int = 50
     default_results: int = 10
     rate_limit_per_minute: int = 60
+    search_cache_ttl_seconds: int = 300
+    search_cache_max_entries: int = 512
 
     # Content Extraction
     max_content_length: int = 5000
     extract_timeout_seconds: int = 10
+    extractor_backend: str = "trafilatura"  # "trafilatura" or "readability"
+    max_download_bytes: int = 2_000_000
+    extract_cache_ttl_seconds: int = 300
+    extract_cache_max_entries: int = 1024
+    extract_max_concurrency: int = 20
 
     # AI Features (optional)
     openai_api_key: str = ""
+    ai_cache_max_entries: int = 4096
+    openai_max_concurrency: int = 8
 
     class Config:
         env_file = ".env"
         case_sensitive = False
 
-    @property
-    def api_keys_list(self) -> List[str]:
-        """Parse comma-separated API keys into a list."""
-        return [key.strip() for key in self.api_keys.split(",") if key.strip()]
+    @cached_property
+    def api_keys_set(self) -> FrozenSet[str]:
+        """Parse comma-separated API keys into a set (computed once)."""
+        return frozenset(key.strip() for key in self.api_keys.split(",") if key.strip())
 
     @property
     def has_openai(self) -> bool:
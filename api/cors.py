@@ -0,0 +1,119 @@
+"""CORS handling for the fully permissive self-hosted configuration."""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Methods allowed for cross-origin requests (same set as allow_methods=["*"])
+ALLOWED_METHODS = frozenset({"DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"})
+
+# Preflight headers that don't depend on the request
+_PREFLIGHT_HEADERS = [
+    (b"vary", b"Origin"),
+    (b"access-control-allow-methods", ", ".join(sorted(ALLOWED_METHODS)).encode()),
+    (b"access-control-max-age", b"600"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+]
+_PREFLIGHT_OK_BODY = b"OK"
+_PREFLIGHT_BAD_METHOD_BODY = b"Disallowed CORS method"
+
+# Headers set on every non-preflight cross-origin response (replacing any
+# the route already set, like CORSMiddleware's headers.update())
+_SIMPLE_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-credentials", b"true"),
+]
+_SIMPLE_HEADER_NAMES = frozenset(name for name, _ in _SIMPLE_HEADERS)
+
+
+class AllowAllCORSMiddleware:
+    """
+    CORS middleware that allows every origin, method and header.
+
+    Behaves like Starlette's CORSMiddleware configured with
+    allow_origins=["*"], allow_methods=["*"], allow_headers=["*"] and
+    allow_credentials=True, but with the response headers pre-encoded so
+    preflights are answered without building a Response or header dicts.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        origin = headers.get("origin")
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        requested_method = headers.get("access-control-request-method")
+        if scope["method"] == "OPTIONS" and requested_method is not None:
+            await self._preflight_response(origin, requested_method, headers, send)
+            return
+
+        # Credentialed (cookie) requests must get the explicit origin, not "*"
+        has_cookie = "cookie" in headers
+
+        async def send_with_cors_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                if has_cookie:
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers["Access-Control-Allow-Origin"] = origin
+                    response_headers["Access-Control-Allow-Credentials"] = "true"
+                    response_headers.add_vary_header("Origin")
+                else:
+                    message["headers"] = [
+                        *(
+                            (name, value)
+                            for name, value in message.get("headers", ())
+                            if name.lower() not in _SIMPLE_HEADER_NAMES
+                        ),
+                        *_SIMPLE_HEADERS,
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors_headers)
+
+    async def _preflight_response(
+        self, origin: str, requested_method: str, headers: Headers, send: Send
+    ) -> None:
+        """
+        Answer a CORS preflight request.
+
+        Args:
+            origin: Request Origin header (reflected because credentials are allowed)
+            requested_method: Access-Control-Request-Method header
+            headers: All request headers
+            send: ASGI send callable
+        """
+        if requested_method in ALLOWED_METHODS:
+            status, body = 200, _PREFLIGHT_OK_BODY
+        else:
+            status, body = 400, _PREFLIGHT_BAD_METHOD_BODY
+
+        response_headers = [
+            *_PREFLIGHT_HEADERS,
+            (b"access-control-allow-origin", origin.encode("latin-1")),
+            (b"content-length", str(len(body)).encode()),
+        ]
+
+        # All headers are allowed, so mirror back whatever was requested
+        requested_headers = headers.get("access-control-request-headers")
+        if requested_headers is not None:
+            response_headers.append(
+                (b"access-control-allow-headers", requested_headers.encode("latin-1"))
+            )
+
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,19 +1,21 @@
 """Main FastAPI application for LLM Search Engine."""
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, HTMLResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.docs import get_swagger_ui_html
 from contextlib import asynccontextmanager
 import logging
 import asyncio
+import os
 import uvicorn
 
 from config import settings
 from models import HealthResponse
 from services.searxng_client import searxng_client
-from auth import cleanup_old_rate_limit_data
+from services.http_client import get_http_client, close_http_client
+from auth import AuthRateLimitMiddleware, cleanup_old_rate_limit_data
+from cors import AllowAllCORSMiddleware
 from routers import search, stream
 
 # Configure logging
@@ -38,6 +40,10 @@ async def lifespan(app: FastAPI):
     # Start background cleanup task
     cleanup_task = asyncio.create_task(cleanup_old_rate_limit_data())
 
+    # Shared outbound HTTP client; the health check below goes through it,
+    # so it also leaves a warm keep-alive connection to SearXNG in the pool
+    app.state.http = get_http_client()
+
     # Check SearXNG connection
     try:
         is_healthy = await searxng_client.health_check()
@@ -57,6 +63,7 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    await close_http_client()
 
 
 # Create FastAPI app
@@ -75,6 +82,7 @@ app = FastAPI(
     """,
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url=None,  # Disable default docs to use custom
     redoc_url=None,  # Disable default redoc to use custom
 )
@@ -82,15 +90,18 @@ app = FastAPI(
 # Mount static files
 app.mount("/static", StaticFiles(directory="/app/static"), name="static")
 
-# CORS middleware (allow all origins for self-hosted use)
+# API key authentication and rate limiting for the search routes
+# (added before CORS so that CORS wraps it and preflights skip auth)
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    AuthRateLimitMiddleware,
+    protected_paths=[
+        route.path for router in (search.router, stream.router) for route in router.routes
+    ],
 )
 
+# CORS middleware (allow all origins for self-hosted use)
+app.add_middleware(AllowAllCORSMiddleware)
+
 
 # Include routers
 app.include_router(search.router)
@@ -171,7 +182,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     Handle unexpected exceptions.
     """
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
@@ -181,11 +192,16 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 
 # Main entry point
+# Each worker process keeps its own rate limit state and cleanup task, so the
+# effective per-key limit is RATE_LIMIT_PER_MINUTE x WEB_CONCURRENCY.
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
         log_level=settings.log_level,
         reload=False,
     )
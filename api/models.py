@@ -1,13 +1,18 @@
 """Pydantic models for API requests and responses."""
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 from typing import Optional, List
 from datetime import datetime
 
+# Response models are built once per request and never mutated afterwards
+RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore", validate_default=False)
+
 
 class SearchMetadata(BaseModel):
     """Metadata about a search result."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     published_date: Optional[str] = Field(
         None, description="Publication date in ISO 8601 format"
     )
@@ -28,6 +33,8 @@ class SearchMetadata(BaseModel):
 class Citation(BaseModel):
     """Pre-formatted citations in common formats."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     apa: str = Field(..., description="APA format citation")
     mla: str = Field(..., description="MLA format citation")
     chicago: str = Field(..., description="Chicago format citation")
@@ -36,6 +43,8 @@ class Citation(BaseModel):
 class SearchResult(BaseModel):
     """A single search result with LLM-optimized fields."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     title: str = Field(..., description="Page title")
     url: str = Field(..., description="Full URL")
     content: str = Field(..., description="Clean extracted main content")
@@ -50,6 +59,8 @@ class SearchResult(BaseModel):
 class SearchResponse(BaseModel):
     """Response from a standard search request."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     query: str = Field(..., description="Original search query")
     results: List[SearchResult] = Field(..., description="List of search results")
     total_results: int = Field(..., description="Total number of results returned")
@@ -71,6 +82,8 @@ class SearchRequest(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     status: str = Field(..., description="Service status")
     searxng_connected: bool = Field(..., description="Whether SearXNG is reachable")
     version: str = Field("1.0.0", description="API version")
@@ -79,6 +92,8 @@ class HealthResponse(BaseModel):
 class ErrorResponse(BaseModel):
     """Error response format."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     detail: str = Field(..., description="Human-readable error message")
     error_code: str = Field(..., description="Machine-readable error code")
     request_id: Optional[str] = Field(None, description="Request tracking ID")
@@ -1,12 +1,13 @@
 """Standard search endpoint router."""
 
-from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from fastapi import APIRouter, Query, HTTPException, Response, Security
 from typing import Optional
 import logging
 import asyncio
+import numpy as np
 
 from models import SearchResponse, SearchResult, SearchMetadata, Citation
-from auth import verify_api_key_with_rate_limit
+from auth import api_key_header
 from services.searxng_client import searxng_client
 from services.content_extractor import content_extractor
 from services.metadata_enricher import metadata_enricher
@@ -16,12 +17,13 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1", tags=["search"])
+router = APIRouter(
+    prefix="/api/v1", tags=["search"], dependencies=[Security(api_key_header)]
+)
 
 
 @router.get("/search", response_model=SearchResponse)
 async def search(
-    response: Response,
     q: str = Query(..., description="Search query", min_length=1, max_length=500),
     limit: int = Query(
         settings.default_results,
@@ -34,19 +36,12 @@ async def search(
     summarize: bool = Query(False, description="Generate AI summaries (requires OpenAI API key)"),
     embeddings: bool = Query(False, description="Compute embeddings (requires OpenAI API key)"),
     dedup: bool = Query(False, description="Remove semantic duplicates using embeddings (requires OpenAI API key)"),
-    auth_data: tuple = Depends(verify_api_key_with_rate_limit),
 ):
     """
     Perform a web search with LLM-optimized results.
 
     Returns clean, structured results with extracted content, metadata, and citations.
     """
-    api_key, rate_limit_headers = auth_data
-
-    # Add rate limit headers to response
-    for key, value in rate_limit_headers.items():
-        response.headers[key] = value
-
     # Check if AI features are requested but not available
     ai_requested = summarize or embeddings or dedup
     if ai_requested and not settings.has_openai:
@@ -70,33 +65,30 @@ async def search(
         )
 
         if "results" not in searxng_results or not searxng_results["results"]:
-            return SearchResponse(
+            return _json_response(SearchResponse(
                 query=q,
                 results=[],
                 total_results=0,
                 search_time_ms=searxng_results.get("search_time_ms", 0),
                 engines_used=[],
-            )
+            ))
 
         # Process results in parallel
         raw_results = searxng_results["results"]
-        processed_results = await _process_results(
+        processed_results, engines_used = await _process_results(
             raw_results,
             summarize=summarize,
             embeddings=embeddings,
             dedup=dedup
         )
 
-        # Extract engines used
-        engines_used = list(set(r.get("engine", "unknown") for r in raw_results))
-
-        return SearchResponse(
+        return _json_response(SearchResponse(
             query=q,
             results=processed_results,
             total_results=len(processed_results),
             search_time_ms=searxng_results.get("search_time_ms", 0),
             engines_used=engines_used,
-        )
+        ))
 
     except HTTPException:
         raise
@@ -105,12 +97,32 @@ async def search(
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+def _json_response(search_response: SearchResponse) -> Response:
+    """
+    Serialize a search response straight to JSON.
+
+    The model is already validated, so this skips FastAPI's response_model
+    re-validation and lets pydantic-core write the JSON in one pass.
+    response_model on the route is kept for the OpenAPI schema.
+
+    Args:
+        search_response: The response model to send
+
+    Returns:
+        JSON response
+    """
+    return Response(
+        content=search_response.model_dump_json(),
+        media_type="application/json",
+    )
+
+
 async def _process_results(
     raw_results: list,
     summarize: bool = False,
     embeddings: bool = False,
     dedup: bool = False
-) -> list[SearchResult]:
+) -> tuple[list[SearchResult], list[str]]:
     """
     Process raw SearXNG results into LLM-optimized format.
 
@@ -121,68 +133,107 @@ async def _process_results(
         dedup: Remove semantic duplicates
 
     Returns:
-        List of processed SearchResult objects
+        Tuple of (processed SearchResult objects, engines used)
     """
     # Extract content from ALL URLs concurrently
     urls_to_extract = [r.get("url") for r in raw_results]
     extracted_content = await content_extractor.batch_extract(urls_to_extract)
 
-    # Process all results in parallel
-    tasks = []
+    # Process results (pure CPU work, so plain loops instead of tasks).
+    # Results that can't be resolved are dropped individually.
+    engines_used: set[str] = set()
+    resolved = []
     for result in raw_results:
-        tasks.append(_process_single_result(result, extracted_content))
-
-    processed_results = await asyncio.gather(*tasks, return_exceptions=True)
+        engines_used.add(result.get("engine", "unknown"))
+        fields = _resolve_content(result, extracted_content)
+        if fields is not None:
+            resolved.append((result, *fields))
+
+    # Enrichment is the regex-heavy part, so it runs in a worker thread to
+    # keep the event loop free for other requests
+    metadata_dicts = await asyncio.to_thread(
+        metadata_enricher.enrich_batch,
+        [result for result, *_ in resolved],
+        [content for *_, content in resolved],
+    )
 
-    # Filter out exceptions and None results
     processed = []
-    for result in processed_results:
-        if isinstance(result, Exception):
-            logger.error(f"Error processing result: {result}")
+    for (result, title, snippet, content), metadata_dict in zip(resolved, metadata_dicts):
+        if metadata_dict is None:
             continue
-        if result is not None:
-            processed.append(result)
+        processed_result = _process_single_result(
+            result, title, snippet, content, metadata_dict
+        )
+        if processed_result is not None:
+            processed.append(processed_result)
 
     # Apply AI features if requested
     if summarize or embeddings:
-        processed = await _apply_ai_features(processed, summarize, embeddings)
+        processed, result_embeddings = await _apply_ai_features(
+            processed, summarize, embeddings
+        )
 
-    # Apply deduplication if requested
-    if dedup and embeddings:
-        processed = _deduplicate_results(processed)
+        # Apply deduplication if requested
+        if dedup and embeddings:
+            processed = _deduplicate_results(processed, result_embeddings)
 
-    return processed
+    return processed, list(engines_used)
 
 
-async def _process_single_result(
-    result: dict,
-    extracted_content: dict
-) -> SearchResult:
+def _resolve_content(
+    result: dict, extracted_content: dict
+) -> Optional[tuple[str, str, str]]:
     """
-    Process a single search result.
+    Pick the title, snippet and content to use for a search result.
 
     Args:
         result: Raw result from SearXNG
         extracted_content: Pre-fetched content for all URLs
 
     Returns:
-        Processed SearchResult
+        Tuple of (title, snippet, content) or None if the result is unusable
     """
     try:
-        url = result.get("url", "")
-        title = result.get("title", "Untitled")
-        snippet = result.get("content", "")[:500]  # Limit snippet length
+        title = result.get("title") or "Untitled"
+        snippet = (result.get("content") or "")[:500]  # Limit snippet length
 
         # Get extracted content or fall back to snippet
-        extracted = extracted_content.get(url, {})
+        extracted = extracted_content.get(result.get("url", ""), {})
         content = extracted.get("content") or snippet or "No content available."
 
         # Use extracted title if available
         if extracted.get("title"):
             title = extracted["title"]
 
-        # Enrich with metadata
-        metadata_dict = metadata_enricher.enrich(result, content)
+        return title, snippet, content
+
+    except Exception as e:
+        logger.error(f"Error processing result {result.get('url')}: {e}")
+        return None
+
+
+def _process_single_result(
+    result: dict,
+    title: str,
+    snippet: str,
+    content: str,
+    metadata_dict: dict
+) -> Optional[SearchResult]:
+    """
+    Process a single search result.
+
+    Args:
+        result: Raw result from SearXNG
+        title: Result title
+        snippet: Result snippet
+        content: Extracted content (or snippet fallback)
+        metadata_dict: Metadata from the enricher
+
+    Returns:
+        Processed SearchResult or None if processing fails
+    """
+    try:
+        url = result.get("url", "")
 
         # Generate citations
         citations_dict = citation_formatter.format_citations(
@@ -216,7 +267,7 @@ async def _apply_ai_features(
     results: list[SearchResult],
     summarize: bool,
     embeddings: bool
-) -> list[SearchResult]:
+) -> tuple[list[SearchResult], list[Optional[np.ndarray]]]:
     """
     Apply AI features (summarization and embeddings) to results.
 
@@ -226,7 +277,7 @@ async def _apply_ai_features(
         embeddings: Whether to generate embeddings
 
     Returns:
-        Updated results with AI features
+        Tuple of (updated results with AI features, float32 embeddings per result)
     """
     # Generate embeddings in batch (more efficient)
     result_embeddings = []
@@ -259,27 +310,29 @@ async def _apply_ai_features(
             citation=result.citation,
             engine=result.engine,
             summary=summary,
-            embedding=embedding,
+            # Embeddings stay float32 until they reach the response model
+            embedding=embedding.tolist() if embedding is not None else None,
         )
         updated_results.append(updated_result)
 
-    return updated_results
+    return updated_results, result_embeddings
 
 
-def _deduplicate_results(results: list[SearchResult]) -> list[SearchResult]:
+def _deduplicate_results(
+    results: list[SearchResult], result_embeddings: list[Optional[np.ndarray]]
+) -> list[SearchResult]:
     """
     Remove duplicate results based on embedding similarity.
 
     Args:
-        results: List of search results with embeddings
+        results: List of search results
+        result_embeddings: float32 embedding for each result (or None)
 
     Returns:
         Deduplicated list of results
     """
-    # Extract embeddings with indices
-    results_with_embeddings = [
-        (i, result.embedding) for i, result in enumerate(results)
-    ]
+    # Pair embeddings with indices
+    results_with_embeddings = list(enumerate(result_embeddings))
 
     # Get indices to keep
     keep_indices = ai_service.deduplicate_by_embeddings(
@@ -1,13 +1,14 @@
 """Streaming search endpoint router."""
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Query, Security
 from fastapi.responses import StreamingResponse
 from typing import Optional, AsyncGenerator
+from pydantic import BaseModel
 import logging
-import json
+import orjson
 import asyncio
 
-from auth import verify_api_key_with_rate_limit
+from auth import api_key_header
 from services.searxng_client import searxng_client
 from services.content_extractor import content_extractor
 from services.metadata_enricher import metadata_enricher
@@ -17,7 +18,16 @@ from models import SearchResult, SearchMetadata, Citation
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1", tags=["search"])
+# Pre-encoded SSE frame pieces for each event type we emit
+_SSE_PREFIXES = {
+    event: b"event: " + event.encode() + b"\ndata: "
+    for event in ("result", "metadata", "error", "done")
+}
+_SSE_TAIL = b"\n\n"
+
+router = APIRouter(
+    prefix="/api/v1", tags=["search"], dependencies=[Security(api_key_header)]
+)
 
 
 @router.get("/search/stream")
@@ -31,26 +41,22 @@ async def search_stream(
     ),
     engines: Optional[str] = Query(None, description="Comma-separated engine names"),
     language: str = Query("en", description="Language code"),
-    auth_data: tuple = Depends(verify_api_key_with_rate_limit),
 ):
     """
     Perform a web search with streaming results.
 
     Returns results as Server-Sent Events (SSE) as they are processed.
     """
-    api_key, rate_limit_headers = auth_data
-
     # Create the streaming response
     return StreamingResponse(
         _stream_search_results(q, limit, engines, language),
         media_type="text/event-stream",
-        headers=rate_limit_headers,
     )
 
 
 async def _stream_search_results(
     query: str, limit: int, engines: Optional[str], language: str
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Generator function that streams search results as SSE events.
 
@@ -61,7 +67,7 @@ async def _stream_search_results(
         language: Language code
 
     Yields:
-        SSE formatted strings
+        SSE formatted events as bytes
     """
     try:
         # Query SearXNG
@@ -81,28 +87,43 @@ async def _stream_search_results(
 
         raw_results = searxng_results["results"]
 
-        # Process and stream each result as it's ready
+        # Process all results concurrently and stream each one as it's ready
+        # (page fetches are bounded by the content extractor). Extraction
+        # shares one overall deadline, like batch_extract on /search, so a
+        # throttled host can't hold the stream open.
+        deadline = asyncio.get_running_loop().time() + settings.extract_timeout_seconds
+        tasks = []
+        engines_used: set[str] = set()
         for result in raw_results:
-            try:
-                processed = await _process_single_result(result)
-                if processed:
-                    # Send result event
-                    yield _format_sse("result", processed.model_dump())
+            engines_used.add(result.get("engine", "unknown"))
+            tasks.append(asyncio.create_task(_process_single_result(result, deadline)))
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                processed = await next_done
+                if not processed:
+                    continue
 
-            except Exception as e:
-                logger.error(f"Error processing result {result.get('url')}: {e}")
-                # Send error event but continue
-                yield _format_sse("error", {
-                    "error": f"Failed to process result: {str(e)}",
-                    "url": result.get("url")
-                })
+                try:
+                    # Send result event
+                    event = _format_sse_model("result", processed)
+                except Exception as e:
+                    logger.error(f"Error processing result {processed.url}: {e}")
+                    # Send error event but continue
+                    event = _format_sse("error", {
+                        "error": f"Failed to process result: {str(e)}",
+                        "url": processed.url
+                    })
+                yield event
+        finally:
+            # Stop outstanding work if the client disconnects mid-stream
+            for task in tasks:
+                task.cancel()
 
         # Send metadata event
-        engines_used = list(set(r.get("engine", "unknown") for r in raw_results))
         yield _format_sse("metadata", {
             "total_results": len(raw_results),
             "search_time_ms": searxng_results.get("search_time_ms", 0),
-            "engines_used": engines_used
+            "engines_used": list(engines_used)
         })
 
         # Send completion event
@@ -114,39 +135,40 @@ async def _stream_search_results(
         yield _format_sse("done", {"status": "error"})
 
 
-async def _process_single_result(result: dict) -> Optional[SearchResult]:
+async def _process_single_result(result: dict, deadline: float) -> Optional[SearchResult]:
     """
     Process a single search result.
 
     Args:
         result: Raw SearXNG result
+        deadline: Event loop time after which extraction is abandoned and
+            the snippet is used instead
 
     Returns:
         Processed SearchResult or None if processing fails
     """
     try:
         url = result.get("url", "")
-        title = result.get("title", "Untitled")
-        snippet = result.get("content", "")[:500]
+        title = result.get("title") or "Untitled"
+        snippet = (result.get("content") or "")[:500]
 
-        # Extract content (with timeout)
+        # Extract content (the fetch itself carries on in the background
+        # if the deadline passes, so its result still reaches the cache)
         try:
-            extracted = await asyncio.wait_for(
-                content_extractor.extract_from_url(url),
-                timeout=settings.extract_timeout_seconds
-            )
+            async with asyncio.timeout_at(deadline):
+                extracted = await content_extractor.extract_from_url(url)
             content = extracted.get("content") or snippet or "No content available."
             if extracted.get("title"):
                 title = extracted["title"]
-        except asyncio.TimeoutError:
-            logger.warning(f"Content extraction timeout for {url}")
+        except TimeoutError:
+            logger.warning(f"Content extraction deadline reached for {url}")
             content = snippet or "No content available."
         except Exception as e:
             logger.warning(f"Content extraction failed for {url}: {e}")
             content = snippet or "No content available."
 
-        # Enrich with metadata
-        metadata_dict = metadata_enricher.enrich(result, content)
+        # Enrich with metadata (CPU-bound, so off the event loop)
+        metadata_dict = await asyncio.to_thread(metadata_enricher.enrich, result, content)
 
         # Generate citations
         citations_dict = citation_formatter.format_citations(
@@ -172,7 +194,7 @@ async def _process_single_result(result: dict) -> Optional[SearchResult]:
         return None
 
 
-def _format_sse(event: str, data: dict) -> str:
+def _format_sse(event: str, data: dict) -> bytes:
     """
     Format data as Server-Sent Event.
 
@@ -181,7 +203,24 @@ def _format_sse(event: str, data: dict) -> str:
         data: Event data
 
     Returns:
-        SSE formatted string
+        SSE formatted event as bytes
+    """
+    json_data = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return _SSE_PREFIXES[event] + json_data + _SSE_TAIL
+
+
+def _format_sse_model(event: str, model: BaseModel) -> bytes:
+    """
+    Format a Pydantic model as Server-Sent Event.
+
+    Serializes straight from the model instead of going through model_dump().
+
+    Args:
+        event: Event type
+        model: Event data
+
+    Returns:
+        SSE formatted event as bytes
     """
-    json_data = json.dumps(data)
-    return f"event: {event}\ndata: {json_data}\n\n"
+    json_data = model.model_dump_json().encode()
+    return _SSE_PREFIXES[event] + json_data + _SSE_TAIL
@@ -1,14 +1,52 @@
 """AI-powered features using OpenAI API."""
 
+import asyncio
+import hashlib
 import logging
+import math
 from typing import List, Optional
 from openai import AsyncOpenAI
 import numpy as np
 
 from config import settings
+from services.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_MODEL = "gpt-4o-mini"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def _cache_key(*parts: str) -> bytes:
+    """
+    Build a compact cache key from model name and input text.
+
+    Args:
+        parts: Strings identifying the request
+
+    Returns:
+        SHA-256 digest of the NUL-joined parts
+    """
+    return hashlib.sha256("\0".join(parts).encode()).digest()
+
+
+def _to_vector(embedding: List[float]) -> np.ndarray:
+    """
+    Convert an API embedding to a read-only float32 vector.
+
+    OpenAI embeddings are float32 on the wire, so this is lossless. The vector
+    is shared through the cache, hence read-only.
+
+    Args:
+        embedding: Embedding as returned by the API
+
+    Returns:
+        float32 ndarray
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    vector.flags.writeable = False
+    return vector
+
 
 class AIService:
     """AI service for summarization, embeddings, and deduplication."""
@@ -16,6 +54,11 @@ class AIService:
     def __init__(self):
         """Initialize AI service."""
         self.client = None
+        # Exact-match caches; embeddings are stored as float32 to keep them small
+        self._summary_cache = LRUCache(settings.ai_cache_max_entries)
+        self._embedding_cache = LRUCache(settings.ai_cache_max_entries)
+        # Caps in-flight OpenAI requests to stay within account rate limits
+        self._semaphore = asyncio.Semaphore(settings.openai_max_concurrency)
         if settings.has_openai:
             self.client = AsyncOpenAI(api_key=settings.openai_api_key)
             logger.info("OpenAI client initialized")
@@ -44,6 +87,11 @@ class AIService:
             if len(content) > max_chars:
                 truncated_content += "..."
 
+            cache_key = _cache_key(SUMMARY_MODEL, title, truncated_content)
+            cached = self._summary_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             prompt = f"""Summarize the following article in 2-3 concise sentences. Focus on the main points and key takeaways.
 
 Title: {title}
@@ -53,20 +101,22 @@ Content:
 
 Summary:"""
 
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that creates concise, accurate summaries of articles and web content.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=150,
-                temperature=0.3,
-            )
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(
+                    model=SUMMARY_MODEL,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a helpful assistant that creates concise, accurate summaries of articles and web content.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=150,
+                    temperature=0.3,
+                )
 
             summary = response.choices[0].message.content.strip()
+            self._summary_cache.set(cache_key, summary)
             logger.debug(f"Generated summary for: {title[:50]}...")
             return summary
 
@@ -74,7 +124,7 @@ Summary:"""
             logger.error(f"Failed to generate summary: {e}")
             return None
 
-    async def generate_embedding(self, text: str) -> Optional[List[float]]:
+    async def generate_embedding(self, text: str) -> Optional[np.ndarray]:
         """
         Generate vector embedding for text.
 
@@ -82,7 +132,7 @@ Summary:"""
             text: Text to embed
 
         Returns:
-            Embedding vector or None if fails
+            float32 embedding vector or None if fails
         """
         if not self.client:
             logger.warning("OpenAI client not initialized")
@@ -93,11 +143,18 @@ Summary:"""
             max_chars = 8000
             truncated_text = text[:max_chars]
 
-            response = await self.client.embeddings.create(
-                model="text-embedding-3-small", input=truncated_text
-            )
+            cache_key = _cache_key(EMBEDDING_MODEL, truncated_text)
+            cached = self._embedding_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            async with self._semaphore:
+                response = await self.client.embeddings.create(
+                    model=EMBEDDING_MODEL, input=truncated_text
+                )
 
-            embedding = response.data[0].embedding
+            embedding = _to_vector(response.data[0].embedding)
+            self._embedding_cache.set(cache_key, embedding)
             logger.debug(f"Generated embedding with dimension: {len(embedding)}")
             return embedding
 
@@ -105,7 +162,7 @@ Summary:"""
             logger.error(f"Failed to generate embedding: {e}")
             return None
 
-    async def generate_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[Optional[np.ndarray]]:
         """
         Generate vector embeddings for multiple texts in a single API call.
 
@@ -113,7 +170,7 @@ Summary:"""
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors (or None for failed embeddings)
+            List of float32 embedding vectors (or None for failed embeddings)
         """
         if not self.client:
             logger.warning("OpenAI client not initialized")
@@ -127,24 +184,45 @@ Summary:"""
             max_chars = 8000
             truncated_texts = [text[:max_chars] for text in texts]
 
+            # Serve what we can from the cache and only request the rest
+            cache_keys = [_cache_key(EMBEDDING_MODEL, text) for text in truncated_texts]
+            all_embeddings = [self._embedding_cache.get(key) for key in cache_keys]
+            missing = [i for i, embedding in enumerate(all_embeddings) if embedding is None]
+
             # OpenAI supports batch embeddings (up to 2048 inputs)
-            # Process in batches of 100 to be safe
+            # Process in batches of 100 to be safe, sending batches concurrently
             batch_size = 100
-            all_embeddings = []
-
-            for i in range(0, len(truncated_texts), batch_size):
-                batch = truncated_texts[i:i + batch_size]
+            batches = [
+                missing[start:start + batch_size]
+                for start in range(0, len(missing), batch_size)
+            ]
+
+            async def embed_batch(batch_indices: List[int]):
+                async with self._semaphore:
+                    return await self.client.embeddings.create(
+                        model=EMBEDDING_MODEL,
+                        input=[truncated_texts[i] for i in batch_indices]
+                    )
+
+            responses = await asyncio.gather(
+                *(embed_batch(batch) for batch in batches), return_exceptions=True
+            )
 
-                response = await self.client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=batch
-                )
+            for batch_indices, response in zip(batches, responses):
+                if isinstance(response, Exception):
+                    # Leave this batch's embeddings as None
+                    logger.error(f"Failed to generate batch embeddings: {response}")
+                    continue
 
-                # Extract embeddings in order
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+                # Embeddings come back in input order
+                for i, item in zip(batch_indices, response.data):
+                    all_embeddings[i] = _to_vector(item.embedding)
+                    self._embedding_cache.set(cache_keys[i], all_embeddings[i])
 
-            logger.info(f"Generated {len(all_embeddings)} embeddings in batch")
+            logger.info(
+                f"Generated {len(missing)} embeddings in batch "
+                f"({len(texts) - len(missing)} cached)"
+            )
             return all_embeddings
 
         except Exception as e:
@@ -165,17 +243,15 @@ Summary:"""
             Similarity score 0-1
         """
         try:
-            a = np.array(vec1)
-            b = np.array(vec2)
-
-            dot_product = np.dot(a, b)
-            norm_a = np.linalg.norm(a)
-            norm_b = np.linalg.norm(b)
+            # float32 halves the bytes touched; asarray skips the copy for arrays
+            a = np.asarray(vec1, dtype=np.float32)
+            b = np.asarray(vec2, dtype=np.float32)
 
-            if norm_a == 0 or norm_b == 0:
+            denom = math.sqrt(float(a @ a) * float(b @ b))
+            if denom == 0:
                 return 0.0
 
-            return float(dot_product / (norm_a * norm_b))
+            return float(a @ b) / denom
 
         except Exception as e:
             logger.error(f"Failed to calculate cosine similarity: {e}")
@@ -197,28 +273,34 @@ Summary:"""
         if not results_with_embeddings:
             return []
 
-        # Track which indices to keep
-        keep_indices = []
-        seen_embeddings = []
-
-        for idx, embedding in results_with_embeddings:
-            if embedding is None:
-                # Keep results without embeddings
-                keep_indices.append(idx)
-                continue
-
-            # Check similarity with all previously seen embeddings
-            is_duplicate = False
-            for seen_emb in seen_embeddings:
-                similarity = self.cosine_similarity(embedding, seen_emb)
-                if similarity >= threshold:
-                    logger.debug(f"Found duplicate result (similarity: {similarity:.3f})")
-                    is_duplicate = True
-                    break
-
-            if not is_duplicate:
-                keep_indices.append(idx)
-                seen_embeddings.append(embedding)
+        # Results without embeddings are always kept
+        keep = np.ones(len(results_with_embeddings), dtype=bool)
+        rows = [
+            i for i, (_, embedding) in enumerate(results_with_embeddings)
+            if embedding is not None
+        ]
+
+        if rows:
+            # L2-normalize once so a single matmul yields all cosine similarities
+            matrix = np.asarray(
+                [results_with_embeddings[i][1] for i in rows], dtype=np.float32
+            )
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0  # Zero vectors are similar to nothing
+            matrix /= norms
+            similar = np.triu(matrix @ matrix.T >= threshold, k=1)
+
+            # Greedy pass: each kept result removes its later near-duplicates
+            duplicate = np.zeros(len(rows), dtype=bool)
+            for i in range(len(rows)):
+                if not duplicate[i]:
+                    duplicate |= similar[i]
+
+            keep[np.asarray(rows)[duplicate]] = False
+
+        keep_indices = [
+            idx for (idx, _), kept in zip(results_with_embeddings, keep) if kept
+        ]
 
         logger.info(
             f"Deduplication: kept {len(keep_indices)}/{len(results_with_embeddings)} results"
@@ -0,0 +1,59 @@
+"""Small in-process caches shared by the services."""
+
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import time
+
+
+class LRUCache:
+    """Mapping that evicts the least recently used entry once full."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Seconds an entry stays valid (None keeps entries until evicted)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Values are stored with the monotonic time they were set
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Look up a key, marking it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        try:
+            stored_at, value = self._data[key]
+        except KeyError:
+            return default
+        if self.ttl is not None and time.monotonic() - stored_at >= self.ttl:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the oldest entry if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
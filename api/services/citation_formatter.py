@@ -1,7 +1,8 @@
 """Citation formatting service for generating academic citations."""
 
 from typing import Dict, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from urllib.parse import urlparse
 import re
 import logging
@@ -12,6 +13,23 @@ logger = logging.getLogger(__name__)
 class CitationFormatter:
     """Format citations in common academic styles."""
 
+    # Common title suffixes, applied in order
+    _TITLE_SUFFIX_PATTERNS = (
+        re.compile(r"\s*-\s*[^-]+$"),  # " - Site Name" at end
+        re.compile(r"\s*\|\s*[^|]+$"),  # " | Site Name" at end
+    )
+
+    # Well-known sources with a preferred author name
+    _SPECIAL_AUTHORS = {
+        "nytimes": "The New York Times",
+        "bbc": "BBC",
+        "github": "GitHub",
+        "stackoverflow": "Stack Overflow",
+        "wikipedia": "Wikipedia",
+        "arxiv": "arXiv",
+        "pubmed": "PubMed",
+    }
+
     def format_citations(
         self,
         title: str,
@@ -43,7 +61,7 @@ class CitationFormatter:
 
         # Use current year if no date available
         if not year:
-            year = str(datetime.utcnow().year)
+            year = str(datetime.now(timezone.utc).year)
 
         # Clean title
         title = self._clean_title(title)
@@ -69,13 +87,8 @@ class CitationFormatter:
             Cleaned title
         """
         # Remove common suffixes
-        suffixes_to_remove = [
-            r"\s*-\s*[^-]+$",  # " - Site Name" at end
-            r"\s*\|\s*[^|]+$",  # " | Site Name" at end
-        ]
-
-        for pattern in suffixes_to_remove:
-            title = re.sub(pattern, "", title)
+        for pattern in self._TITLE_SUFFIX_PATTERNS:
+            title = pattern.sub("", title)
 
         # Ensure title ends with period for citations (if not already punctuated)
         if title and not title[-1] in ".!?":
@@ -83,42 +96,32 @@ class CitationFormatter:
 
         return title.strip()
 
-    def _generate_author_from_source(self, source: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _generate_author_from_source(source: str) -> str:
         """
         Generate author name from source domain.
 
+        Cached because a handful of domains account for most results.
+
         Args:
             source: Domain name
 
         Returns:
             Author string
         """
-        # Remove TLD
-        parts = source.split(".")
-        if len(parts) > 1:
-            name = parts[-2]
-        else:
-            name = source
-
-        # Capitalize
-        name = name.capitalize()
-
-        # Handle special cases
-        special_cases = {
-            "nytimes": "The New York Times",
-            "bbc": "BBC",
-            "github": "GitHub",
-            "stackoverflow": "Stack Overflow",
-            "wikipedia": "Wikipedia",
-            "arxiv": "arXiv",
-            "pubmed": "PubMed",
-        }
+        parts = source.lower().split(".")
 
-        for key, value in special_cases.items():
-            if key in source.lower():
-                return value
+        # Handle special cases by whole domain label, so subdomains
+        # (en.wikipedia.org) and country suffixes (bbc.co.uk) still match
+        special_authors = CitationFormatter._SPECIAL_AUTHORS
+        for label in parts:
+            if label in special_authors:
+                return special_authors[label]
 
-        return name
+        # Remove TLD and capitalize
+        name = parts[-2] if len(parts) > 1 else parts[0]
+        return name.capitalize()
 
     def _format_apa(
         self,
@@ -150,14 +153,10 @@ class CitationFormatter:
         if published_date:
             try:
                 # Parse ISO date to "Month Day"
-                parts = published_date.split("-")
-                if len(parts) == 3:
-                    dt = datetime.strptime(published_date, "%Y-%m-%d")
-                    month_day = dt.strftime("%B %d")
-                    date_str = f"{year}, {month_day}"
-                else:
-                    date_str = year
-            except Exception:
+                dt = datetime.fromisoformat(published_date)
+                month_day = dt.strftime("%B %d")
+                date_str = f"{year}, {month_day}"
+            except ValueError:
                 date_str = year
         else:
             date_str = year
@@ -2,65 +2,291 @@
 
 import httpx
 import asyncio
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 from readability import Document
 import html2text
-from typing import Optional, Dict
+import trafilatura
+from typing import AsyncIterator, Optional, Dict, Tuple
 import logging
+import threading
+import time
 from urllib.parse import urlparse
 
 from config import settings
+from services.http_client import get_http_client
+from services.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Parse from bytes so documents with an XML encoding declaration are accepted
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+# Hosts whose per-host limiter state is kept
+_MAX_TRACKED_HOSTS = 1024
+
+
+class AIMDLimiter:
+    """
+    Concurrency limiter for a single host that backs off when the host
+    reports overload (AIMD).
+
+    Starts at max_limit. When the host answers 429 or 503 the limit is cut
+    multiplicatively; every other completed request grows it back
+    additively (by one permit per full window of requests). Slow or dead
+    hosts are handled by the request timeout, not by this limiter.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_limit: Upper bound on concurrent requests
+            min_limit: Lower bound on concurrent requests
+            decrease_factor: Multiplier applied to the limit on overload
+            cooldown: Minimum seconds between two decreases
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.limit = float(max_limit)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until a permit is available and take it."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+
+    async def release(self, overloaded: bool = False) -> None:
+        """
+        Return a permit and update the limit from the request outcome.
+
+        Args:
+            overloaded: Whether the host answered 429 or 503
+        """
+        async with self._condition:
+            self._in_flight -= 1
+
+            if overloaded:
+                # Decrease at most once per cooldown so that a burst of
+                # throttled responses from one window doesn't collapse the limit
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
+
 
 class ContentExtractor:
     """Extract clean content from web pages."""
 
-    def __init__(self):
-        """Initialize the content extractor."""
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the content extractor.
+
+        Args:
+            client: HTTP client to fetch pages with (defaults to the shared client)
+        """
+        self._client = client
         self.timeout = httpx.Timeout(settings.extract_timeout_seconds)
         self.max_length = settings.max_content_length
-
-        # Configure html2text for clean markdown conversion
-        self.html_to_text = html2text.HTML2Text()
-        self.html_to_text.ignore_links = False
-        self.html_to_text.ignore_images = True
-        self.html_to_text.ignore_emphasis = False
-        self.html_to_text.body_width = 0  # No wrapping
-        self.html_to_text.single_line_break = True
+        self.max_download_bytes = settings.max_download_bytes
+        # Recent successful extractions, and fetches currently in flight so
+        # concurrent requests for the same URL share one download
+        self._cache = LRUCache(
+            settings.extract_cache_max_entries, ttl=settings.extract_cache_ttl_seconds
+        )
+        self._pending: Dict[str, "asyncio.Task[Dict[str, Optional[str]]]"] = {}
+        # Overall cap on concurrent page downloads, plus a limiter per host
+        # that only backs off for hosts that say they're overloaded
+        self._fetch_slots = asyncio.Semaphore(settings.extract_max_concurrency)
+        self._host_limiters = LRUCache(_MAX_TRACKED_HOSTS)
+        # HTML parsing runs in worker threads, and HTML2Text keeps parser
+        # state on the instance, so each thread gets its own converter
+        self._thread_local = threading.local()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for page fetches."""
+        return self._client or get_http_client()
+
+    @property
+    def html_to_text(self) -> html2text.HTML2Text:
+        """html2text converter for the current thread."""
+        converter = getattr(self._thread_local, "html_to_text", None)
+        if converter is None:
+            # Configure html2text for clean markdown conversion
+            converter = html2text.HTML2Text()
+            converter.ignore_links = False
+            converter.ignore_images = True
+            converter.ignore_emphasis = False
+            converter.body_width = 0  # No wrapping
+            converter.single_line_break = True
+            self._thread_local.html_to_text = converter
+        return converter
 
     async def extract_from_url(self, url: str) -> Dict[str, Optional[str]]:
         """
         Extract clean content from a URL.
 
+        Results are cached for a few minutes, and concurrent calls for the
+        same URL wait on a single fetch.
+
         Args:
             url: The URL to extract content from
 
         Returns:
             Dict with 'content' and 'title' keys
         """
-        try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout, follow_redirects=True
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
+        cached = self._cache.get(url)
+        if cached is not None:
+            return cached
+
+        task = self._pending.get(url)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_extract(url))
+            self._pending[url] = task
+            task.add_done_callback(lambda _: self._pending.pop(url, None))
 
-                # Only process HTML content
-                content_type = response.headers.get("content-type", "")
-                if "text/html" not in content_type:
-                    return {"content": None, "title": None}
+        # Shielded so one caller giving up doesn't cancel the fetch for others
+        return await asyncio.shield(task)
 
-                html = response.text
-                return self.extract_from_html(html, url)
+    async def _fetch_and_extract(self, url: str) -> Dict[str, Optional[str]]:
+        """
+        Fetch a URL and extract its content, caching successful extractions.
 
+        Args:
+            url: The URL to extract content from
+
+        Returns:
+            Dict with 'content' and 'title' keys
+        """
+        result = await self._fetch_and_extract_uncached(url)
+        if result.get("content") is not None:
+            self._cache.set(url, result)
+        return result
+
+    async def _fetch_and_extract_uncached(self, url: str) -> Dict[str, Optional[str]]:
+        """
+        Fetch a URL and extract its content.
+
+        Args:
+            url: The URL to extract content from
+
+        Returns:
+            Dict with 'content' and 'title' keys
+        """
+        html = await self._fetch_html(url)
+        if html is None:
+            return {"content": None, "title": None}
+
+        # Parsing is CPU-bound; keep it off the event loop (and outside the
+        # fetch permits, which only bound downloads)
+        return await asyncio.to_thread(self.extract_from_html, html, url)
+
+    async def _fetch_html(self, url: str) -> Optional[str]:
+        """
+        Download a page, holding a permit for its host and a fetch slot.
+
+        The extract timeout covers the download only, not time spent waiting
+        for a permit, so queued pages still get their full timeout.
+
+        Args:
+            url: The URL to fetch
+
+        Returns:
+            Decoded HTML, or None if the page couldn't be fetched or isn't HTML
+        """
+        limiter = self._host_limiter(url)
+        await limiter.acquire()
+        overloaded = False
+        try:
+            async with self._fetch_slots, asyncio.timeout(settings.extract_timeout_seconds):
+                async with self.client.stream(
+                    "GET", url, timeout=self.timeout, follow_redirects=True
+                ) as response:
+                    response.raise_for_status()
+
+                    # Only process HTML content (checked before downloading the body)
+                    content_type = response.headers.get("content-type", "")
+                    if "text/html" not in content_type:
+                        return None
+
+                    return await self._read_html(response)
+
+        except (httpx.TimeoutException, TimeoutError) as e:
+            logger.warning(f"Timed out fetching {url}: {e}")
+        except httpx.HTTPStatusError as e:
+            # Only an explicit signal from the host counts as overload
+            overloaded = e.response.status_code in (429, 503)
+            logger.warning(f"Failed to fetch {url}: {e}")
         except httpx.HTTPError as e:
             logger.warning(f"Failed to fetch {url}: {e}")
-            return {"content": None, "title": None}
         except Exception as e:
             logger.error(f"Error extracting content from {url}: {e}")
-            return {"content": None, "title": None}
+        finally:
+            await limiter.release(overloaded)
+
+        return None
+
+    def _host_limiter(self, url: str) -> AIMDLimiter:
+        """
+        Get (or create) the limiter for a URL's host.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Limiter shared by all fetches to the same host
+        """
+        host = urlparse(url).hostname or ""
+        limiter = self._host_limiters.get(host)
+        if limiter is None:
+            limiter = AIMDLimiter(max_limit=settings.extract_max_concurrency)
+            self._host_limiters.set(host, limiter)
+        return limiter
+
+    async def _read_html(self, response: httpx.Response) -> str:
+        """
+        Read a response body, stopping once max_download_bytes is reached.
+
+        Only the extracted text is kept, so there is no point downloading (and
+        parsing) the tail of very large pages.
+
+        Args:
+            response: Streaming response
+
+        Returns:
+            Decoded, possibly truncated HTML
+        """
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes(65536):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_download_bytes:
+                logger.debug(f"Truncated {response.url} at {size} bytes")
+                break
+
+        body = b"".join(chunks)[: self.max_download_bytes]
+        try:
+            return body.decode(response.encoding or "utf-8", errors="replace")
+        except LookupError:
+            # Unknown charset declared by the server
+            return body.decode("utf-8", errors="replace")
 
     def extract_from_html(self, html: str, url: str = "") -> Dict[str, Optional[str]]:
         """
@@ -74,13 +300,21 @@ class ContentExtractor:
             Dict with 'content' and 'title' keys
         """
         try:
-            # Use readability to extract main content
-            doc = Document(html)
-            title = doc.title()
-            clean_html = doc.summary()
-
-            # Convert to text
-            text_content = self.html_to_text.handle(clean_html)
+            if settings.extractor_backend == "readability":
+                title, text_content = self._readability_extraction(html)
+            else:
+                extracted = trafilatura.bare_extraction(
+                    html,
+                    url=url or None,
+                    no_fallback=True,
+                    favor_precision=True,
+                    include_comments=False,
+                    with_metadata=True,
+                )
+                if not extracted or not extracted.get("text"):
+                    # No main content found
+                    return self._basic_extraction(html)
+                title, text_content = extracted.get("title"), extracted["text"]
 
             # Clean up the text
             text_content = self._clean_text(text_content)
@@ -96,9 +330,22 @@ class ContentExtractor:
             # Fallback to basic extraction
             return self._basic_extraction(html)
 
+    def _readability_extraction(self, html: str) -> Tuple[Optional[str], str]:
+        """
+        Extract main content with readability and convert it to markdown.
+
+        Args:
+            html: HTML content
+
+        Returns:
+            Tuple of (title, text)
+        """
+        doc = Document(html)
+        return doc.title(), self.html_to_text.handle(doc.summary())
+
     def _basic_extraction(self, html: str) -> Dict[str, Optional[str]]:
         """
-        Basic fallback extraction using BeautifulSoup.
+        Basic fallback extraction using lxml.
 
         Args:
             html: HTML content
@@ -107,18 +354,23 @@ class ContentExtractor:
             Dict with 'content' and 'title' keys
         """
         try:
-            soup = BeautifulSoup(html, "lxml")
+            try:
+                tree = lxml_html.fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+            except etree.ParserError:
+                # lxml rejects documents with no elements; there's just no text
+                return {"content": "", "title": None}
 
             # Extract title
-            title_tag = soup.find("title")
-            title = title_tag.get_text() if title_tag else None
+            title = (tree.findtext(".//title") or "").strip() or None
 
-            # Remove script and style elements
-            for element in soup(["script", "style", "nav", "header", "footer"]):
-                element.decompose()
+            # Remove script and style elements (keeping any text that follows them)
+            for element in tree.xpath("//script|//style|//nav|//header|//footer"):
+                element.drop_tree()
 
-            # Get text
-            text = soup.get_text(separator="\n", strip=True)
+            # Get text, one stripped text node per line
+            text = "\n".join(
+                chunk.strip() for chunk in tree.itertext() if not chunk.isspace()
+            )
             text = self._clean_text(text)
 
             if len(text) > self.max_length:
@@ -140,39 +392,81 @@ class ContentExtractor:
         Returns:
             Cleaned text
         """
-        # Remove excessive whitespace
-        lines = [line.strip() for line in text.split("\n")]
-        lines = [line for line in lines if line]  # Remove empty lines
+        # Strip every line and drop empty ones in a single pass, joining with a
+        # single newline (so there are never blank lines left to collapse)
+        return "\n".join(line for line in map(str.strip, text.split("\n")) if line)
+
+    async def iter_extract(
+        self, urls: list[str]
+    ) -> AsyncIterator[Tuple[str, Dict[str, Optional[str]]]]:
+        """
+        Extract content from multiple URLs concurrently, yielding as each finishes.
+
+        Concurrency is bounded by the fetch slots and per-host limiters.
+
+        Args:
+            urls: List of URLs to extract
 
-        # Join with single newline
-        cleaned = "\n".join(lines)
+        Yields:
+            Tuples of (url, extracted content) in completion order
+        """
+        tasks = [asyncio.create_task(self._extract_pair(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Don't leave fetches running if the consumer stops early
+            for task in tasks:
+                task.cancel()
+
+    async def _extract_pair(self, url: str) -> Tuple[str, Dict[str, Optional[str]]]:
+        """
+        Extract a URL, tagging the result with the URL it came from.
 
-        # Remove excessive consecutive newlines
-        while "\n\n\n" in cleaned:
-            cleaned = cleaned.replace("\n\n\n", "\n\n")
+        Args:
+            url: The URL to extract
 
-        return cleaned.strip()
+        Returns:
+            Tuple of (url, extracted content)
+        """
+        try:
+            return url, await self.extract_from_url(url)
+        except Exception as e:
+            logger.error(f"Failed to extract {url}: {e}")
+            return url, {"content": None, "title": None}
 
-    async def batch_extract(self, urls: list[str]) -> Dict[str, Dict[str, Optional[str]]]:
+    async def batch_extract(
+        self, urls: list[str], timeout: Optional[float] = None
+    ) -> Dict[str, Dict[str, Optional[str]]]:
         """
-        Extract content from multiple URLs concurrently.
+        Extract content from multiple URLs concurrently, within an overall deadline.
+
+        Fetches still running at the deadline keep going in the background
+        (so their results land in the cache), but aren't waited for.
 
         Args:
             urls: List of URLs to extract
+            timeout: Overall deadline in seconds (defaults to the extract timeout)
 
         Returns:
-            Dict mapping URLs to extracted content
+            Dict mapping URLs to extracted content (content None for URLs that
+            failed or missed the deadline)
         """
-        tasks = [self.extract_from_url(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if timeout is None:
+            timeout = settings.extract_timeout_seconds
 
         output = {}
-        for url, result in zip(urls, results):
-            if isinstance(result, Exception):
-                logger.error(f"Failed to extract {url}: {result}")
-                output[url] = {"content": None, "title": None}
-            else:
-                output[url] = result
+        try:
+            async with asyncio.timeout(timeout):
+                async for url, result in self.iter_extract(urls):
+                    output[url] = result
+        except TimeoutError:
+            logger.warning(
+                f"Extraction deadline reached with {len(urls) - len(output)} of "
+                f"{len(urls)} URLs unfinished"
+            )
+            for url in urls:
+                output.setdefault(url, {"content": None, "title": None})
 
         return output
 
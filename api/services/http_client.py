@@ -0,0 +1,39 @@
+"""Shared HTTP client for outbound requests to SearXNG and result pages."""
+
+import httpx
+from typing import Optional
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client, creating it on first use.
+
+    Reusing one client keeps connections (and HTTP/2 sessions) alive across
+    requests instead of paying a TCP/TLS handshake for every fetch.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+            timeout=httpx.Timeout(settings.extract_timeout_seconds),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client if it has been created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -2,10 +2,11 @@
 
 import re
 from typing import Optional, Dict, Any, List
-from urllib.parse import urlparse
 from datetime import datetime
 from dateutil import parser as date_parser
 from collections import Counter
+from types import MappingProxyType
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,8 +15,11 @@ logger = logging.getLogger(__name__)
 class MetadataEnricher:
     """Enrich search results with metadata."""
 
+    # No per-instance state; everything below is shared and read-only
+    __slots__ = ()
+
     # Known high-quality domains and their credibility scores
-    CREDIBILITY_SCORES = {
+    CREDIBILITY_SCORES = MappingProxyType({
         # Academic & Research
         "arxiv.org": 0.95,
         "scholar.google.com": 0.95,
@@ -42,10 +46,10 @@ class MetadataEnricher:
         "techcrunch.com": 0.75,
         "arstechnica.com": 0.8,
         "wired.com": 0.75,
-    }
+    })
 
     # Content type patterns
-    CONTENT_TYPE_PATTERNS = {
+    CONTENT_TYPE_PATTERNS = MappingProxyType({
         "article": r"/(article|post|blog|news)/",
         "documentation": r"/(docs|documentation|reference|api|guide)/",
         "forum": r"/(forum|discussion|thread|questions)/",
@@ -53,7 +57,77 @@ class MetadataEnricher:
         "video": r"/(watch|video)/",
         "pdf": r"\.pdf$",
         "wiki": r"/(wiki|encyclopedia)/",
-    }
+    })
+    _CONTENT_TYPE_RES = MappingProxyType({
+        content_type: re.compile(pattern)
+        for content_type, pattern in CONTENT_TYPE_PATTERNS.items()
+    })
+    # Matches if any content type pattern does, so most URLs need one scan
+    _ANY_CONTENT_TYPE_RE = re.compile("|".join(CONTENT_TYPE_PATTERNS.values()))
+
+    # Domain-based content types, checked in order when no pattern matches
+    _DOMAIN_CONTENT_TYPES = (
+        (("github.com",), "code"),
+        (("youtube.com", "youtu.be"), "video"),
+        (("stackoverflow.com",), "forum"),
+        (("wikipedia.org",), "encyclopedia"),
+    )
+
+    # Common URL date patterns: /2024/01/15/, /2024-01-15/, ?date=2024-01-15
+    _URL_DATE_RES = (
+        re.compile(r"/(\d{4})/(\d{2})/(\d{2})/"),  # /2024/01/15/
+        re.compile(r"/(\d{4})-(\d{2})-(\d{2})"),    # /2024-01-15
+        re.compile(r"[?&]date=(\d{4}-\d{2}-\d{2})"),  # ?date=2024-01-15
+    )
+
+    # Common date patterns in text, in priority order. Numeric patterns carry
+    # their field order and are converted directly; the rest go to dateutil.
+    _TEXT_DATE_RES = (
+        (re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b", re.IGNORECASE), "ymd"),  # 2024-01-15
+        (re.compile(r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* (\d{1,2}),? (\d{4})\b", re.IGNORECASE), None),  # Jan 15, 2024
+        (re.compile(r"\b(\d{1,2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* (\d{4})\b", re.IGNORECASE), None),  # 15 Jan 2024
+        (re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b", re.IGNORECASE), "mdy"),  # 01/15/2024
+    )
+
+    # Network location of a URL (optional scheme, then //host), minus "www."
+    _NETLOC_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*:)?//(?:www\.)?([^/?#]*)", re.IGNORECASE)
+
+    _WORD_RE = re.compile(r"\b[a-z]{3,}\b")
+
+    # Common stop words filtered out of keywords
+    _STOP_WORDS = frozenset({
+        'the', 'and', 'for', 'that', 'with', 'this', 'from', 'are', 'was',
+        'but', 'not', 'you', 'all', 'can', 'her', 'has', 'had', 'our',
+        'out', 'one', 'two', 'more', 'than', 'been', 'have', 'will',
+        'what', 'when', 'who', 'which', 'their', 'said', 'each', 'about',
+        'how', 'other', 'into', 'after', 'also', 'some', 'these', 'only',
+        'then', 'now', 'may', 'such', 'very', 'over', 'just', 'where',
+        'most', 'both', 'through', 'way', 'could', 'before', 'does'
+    })
+
+    # Common words per language, each matched only between single spaces
+    _LANGUAGE_RES = MappingProxyType({
+        language: re.compile("(?<= )(?:" + "|".join(words) + ")(?= )")
+        for language, words in (
+            ("en", ("the", "and", "for", "that", "with", "this", "from", "are", "was")),
+            ("es", ("el", "la", "de", "que", "en", "los", "del", "para", "con")),
+            ("fr", ("le", "de", "un", "et", "à", "dans", "les", "des", "pour")),
+            ("de", ("der", "die", "das", "und", "den", "ist", "für", "von", "mit")),
+        )
+    })
+
+    # Direct answer indicators, combined so the text is scanned once
+    _DIRECT_ANSWER_RE = re.compile("|".join((
+        r'^(yes|no)[,\.]',  # Starts with yes/no
+        r'^\d+',  # Starts with a number
+        r'(is|are|was|were)\s+\w+',  # Definition patterns
+        r'means\s+\w+',  # "X means..."
+        r'refers to',  # "X refers to..."
+        r'^the answer is',
+        r'^in short',
+        r'^simply put',
+        r'definition[:]\s*',
+    )))
 
     def enrich(
         self, result: Dict[str, Any], original_content: str = ""
@@ -69,27 +143,64 @@ class MetadataEnricher:
             Dict with metadata fields
         """
         url = result.get("url", "")
-        content = result.get("content", "")
-        title = result.get("title", "")
-        snippet = result.get("snippet", "")
+        content = result.get("content") or ""
+        title = result.get("title") or ""
+        snippet = result.get("snippet") or ""
 
         # Combine all text for analysis
         full_text = original_content or content
 
+        # Shared by the text analyses below so the text is only split and
+        # lowercased once
+        word_count = self._count_words(full_text)
+        text_lower = full_text.lower()
+
+        source = self._extract_source(url)
+
         metadata = {
             "published_date": self._extract_date(result, url, title),
-            "source": self._extract_source(url),
+            "source": source,
             "content_type": self._detect_content_type(url),
-            "word_count": self._count_words(full_text),
-            "credibility_score": self._calculate_credibility(url, result),
-            "language": self._detect_language(full_text),
-            "reading_time_minutes": self._calculate_reading_time(full_text),
-            "keywords": self._extract_keywords(full_text, title),
+            "word_count": word_count,
+            "credibility_score": self._calculate_credibility(url, source),
+            "language": self._detect_language(text_lower),
+            "reading_time_minutes": self._calculate_reading_time(word_count),
+            "keywords": self._extract_keywords(text_lower, title),
             "is_direct_answer": self._detect_direct_answer(snippet, content, title),
         }
 
         return metadata
 
+    def enrich_batch(
+        self, results: List[Dict[str, Any]], contents: Optional[List[str]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Enrich several search results in one call.
+
+        A result that fails to enrich gets None rather than failing the
+        whole batch.
+
+        Args:
+            results: Raw search results from SearXNG
+            contents: Full extracted content for each result (optional)
+
+        Returns:
+            List of metadata dicts (or None), in the same order as results
+        """
+        if contents is None:
+            contents = [""] * len(results)
+
+        enrich = self.enrich
+        batch = []
+        for result, content in zip(results, contents):
+            try:
+                batch.append(enrich(result, content))
+            except Exception as e:
+                logger.error(f"Error enriching result {result.get('url')}: {e}")
+                batch.append(None)
+
+        return batch
+
     def _extract_date(self, result: Dict[str, Any], url: str = "", title: str = "") -> Optional[str]:
         """
         Extract publication date from result, URL, or title.
@@ -112,15 +223,8 @@ class MetadataEnricher:
                 logger.debug(f"Failed to parse publishedDate: {e}")
 
         # Try to extract from URL first (often most reliable)
-        # Common URL patterns: /2024/01/15/, /2024-01-15/, ?date=2024-01-15
-        url_date_patterns = [
-            r"/(\d{4})/(\d{2})/(\d{2})/",  # /2024/01/15/
-            r"/(\d{4})-(\d{2})-(\d{2})",    # /2024-01-15
-            r"[?&]date=(\d{4}-\d{2}-\d{2})",  # ?date=2024-01-15
-        ]
-
-        for pattern in url_date_patterns:
-            match = re.search(pattern, url)
+        for pattern in self._URL_DATE_RES:
+            match = pattern.search(url)
             if match:
                 try:
                     if len(match.groups()) == 3:
@@ -133,53 +237,71 @@ class MetadataEnricher:
                     continue
 
         # Try to extract from title and content
-        content = result.get("content", "") + " " + title
-
-        # Common date patterns
-        date_patterns = [
-            r"\b(\d{4})-(\d{2})-(\d{2})\b",  # 2024-01-15
-            r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* (\d{1,2}),? (\d{4})\b",  # Jan 15, 2024
-            r"\b(\d{1,2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* (\d{4})\b",  # 15 Jan 2024
-            r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b",  # 01/15/2024
-        ]
-
-        for pattern in date_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
+        content = (result.get("content") or "") + " " + title
+
+        max_year = datetime.now().year + 1
+
+        for pattern, field_order in self._TEXT_DATE_RES:
+            match = pattern.search(content)
             if match:
                 try:
-                    date_str = match.group(0)
-                    dt = date_parser.parse(date_str, fuzzy=True)
+                    if field_order is None:
+                        dt = date_parser.parse(match.group(0), fuzzy=True)
+                    else:
+                        dt = self._parse_numeric_date(match, field_order)
                     # Only return dates that seem reasonable (not too far in future)
-                    if dt.year <= datetime.now().year + 1:
+                    if dt.year <= max_year:
                         return dt.date().isoformat()
                 except Exception:
                     continue
 
         return None
 
-    def _extract_source(self, url: str) -> str:
+    @staticmethod
+    def _parse_numeric_date(match: re.Match, field_order: str) -> datetime:
         """
-        Extract source domain from URL.
+        Build a date from an all-numeric match without going through dateutil.
+
+        Follows dateutil's interpretation: month/day/year, unless the first
+        field can only be a day.
 
         Args:
-            url: Full URL
+            match: Match with year, month and day groups
+            field_order: "ymd" or "mdy"
 
         Returns:
-            Domain name
+            Parsed datetime
+
+        Raises:
+            ValueError: If the fields don't form a valid date
+        """
+        if field_order == "ymd":
+            year, month, day = map(int, match.groups())
+        else:
+            month, day, year = map(int, match.groups())
+            if month > 12:
+                month, day = day, month
+        return datetime(year, month, day)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _extract_source(url: str) -> str:
         """
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc
+        Extract source domain from URL.
 
-            # Remove www. prefix
-            if domain.startswith("www."):
-                domain = domain[4:]
+        Cached because the same URLs recur across searches.
 
-            return domain
-        except Exception:
-            return "unknown"
+        Args:
+            url: Full URL
+
+        Returns:
+            Lowercased domain name (empty if the URL has no network location)
+        """
+        match = MetadataEnricher._NETLOC_RE.match(url)
+        return match.group(1).lower() if match else ""
 
-    def _detect_content_type(self, url: str) -> str:
+    @staticmethod
+    def _detect_content_type(url: str) -> str:
         """
         Detect content type from URL patterns.
 
@@ -191,23 +313,22 @@ class MetadataEnricher:
         """
         url_lower = url.lower()
 
-        for content_type, pattern in self.CONTENT_TYPE_PATTERNS.items():
-            if re.search(pattern, url_lower):
-                return content_type
+        # The combined pattern finds the leftmost match rather than the
+        # highest-priority type, so only use it to skip the ordered checks
+        if MetadataEnricher._ANY_CONTENT_TYPE_RE.search(url_lower):
+            for content_type, pattern in MetadataEnricher._CONTENT_TYPE_RES.items():
+                if pattern.search(url_lower):
+                    return content_type
 
         # Check domain for specific types
-        if "github.com" in url_lower:
-            return "code"
-        elif "youtube.com" in url_lower or "youtu.be" in url_lower:
-            return "video"
-        elif "stackoverflow.com" in url_lower:
-            return "forum"
-        elif "wikipedia.org" in url_lower:
-            return "encyclopedia"
+        for domains, content_type in MetadataEnricher._DOMAIN_CONTENT_TYPES:
+            if any(domain in url_lower for domain in domains):
+                return content_type
 
         return "webpage"
 
-    def _count_words(self, text: str) -> Optional[int]:
+    @staticmethod
+    def _count_words(text: str) -> Optional[int]:
         """
         Count words in text.
 
@@ -224,24 +345,26 @@ class MetadataEnricher:
         words = text.split()
         return len(words)
 
-    def _calculate_credibility(
-        self, url: str, result: Dict[str, Any]
-    ) -> Optional[float]:
+    @staticmethod
+    def _calculate_credibility(url: str, source: str) -> Optional[float]:
         """
         Calculate credibility score for a source.
 
         Args:
             url: Source URL
-            result: Search result
+            source: Domain name extracted from the URL
 
         Returns:
             Credibility score 0-1 or None
         """
-        source = self._extract_source(url)
+        labels = source.lower().split(".")
 
-        # Check if we have a predefined score
-        if source in self.CREDIBILITY_SCORES:
-            return self.CREDIBILITY_SCORES[source]
+        # Check if we have a predefined score for the domain or any parent
+        # domain, so subdomains like en.wikipedia.org are scored too
+        for i in range(len(labels) - 1):
+            score = MetadataEnricher.CREDIBILITY_SCORES.get(".".join(labels[i:]))
+            if score is not None:
+                return score
 
         # Calculate heuristic score
         score = 0.5  # Base score
@@ -250,12 +373,14 @@ class MetadataEnricher:
         if url.startswith("https://"):
             score += 0.1
 
-        # Domain characteristics
-        if ".edu" in source:
+        # Domain characteristics (by label, so foo.edu.au counts but
+        # education.com doesn't)
+        suffix_labels = labels[1:]
+        if "edu" in suffix_labels:
             score += 0.2
-        elif ".gov" in source:
+        elif "gov" in suffix_labels:
             score += 0.25
-        elif ".org" in source:
+        elif "org" in suffix_labels:
             score += 0.1
 
         # Penalize certain patterns
@@ -265,66 +390,45 @@ class MetadataEnricher:
         # Clamp to 0-1 range
         return max(0.0, min(1.0, score))
 
-    def _detect_language(self, text: str) -> Optional[str]:
+    @staticmethod
+    def _detect_language(text_lower: str) -> Optional[str]:
         """
         Detect language of text using simple heuristics.
 
         Args:
-            text: Text content
+            text_lower: Lowercased text content
 
         Returns:
             Language code or None
         """
-        if not text or len(text) < 20:
+        if not text_lower or len(text_lower) < 20:
             return None
 
-        # Simple language detection based on common words
-        text_lower = text.lower()
-
-        # English indicators
-        english_words = ['the', 'and', 'for', 'that', 'with', 'this', 'from', 'are', 'was']
-        english_count = sum(1 for word in english_words if f' {word} ' in text_lower)
-
-        # Spanish indicators
-        spanish_words = ['el', 'la', 'de', 'que', 'en', 'los', 'del', 'para', 'con']
-        spanish_count = sum(1 for word in spanish_words if f' {word} ' in text_lower)
-
-        # French indicators
-        french_words = ['le', 'de', 'un', 'et', 'à', 'dans', 'les', 'des', 'pour']
-        french_count = sum(1 for word in french_words if f' {word} ' in text_lower)
-
-        # German indicators
-        german_words = ['der', 'die', 'das', 'und', 'den', 'ist', 'für', 'von', 'mit']
-        german_count = sum(1 for word in german_words if f' {word} ' in text_lower)
-
-        # Determine language (simple majority vote)
+        # Simple language detection based on common words: count how many
+        # distinct indicator words of each language appear in the text
         counts = {
-            'en': english_count,
-            'es': spanish_count,
-            'fr': french_count,
-            'de': german_count
+            language: len(set(pattern.findall(text_lower)))
+            for language, pattern in MetadataEnricher._LANGUAGE_RES.items()
         }
 
+        # Determine language (simple majority vote)
         max_count = max(counts.values())
         if max_count >= 2:  # At least 2 matches
             return max(counts, key=counts.get)
 
         return 'en'  # Default to English
 
-    def _calculate_reading_time(self, text: str) -> Optional[int]:
+    @staticmethod
+    def _calculate_reading_time(word_count: Optional[int]) -> Optional[int]:
         """
         Calculate estimated reading time in minutes.
 
         Args:
-            text: Text content
+            word_count: Number of words in the text
 
         Returns:
             Reading time in minutes or None
         """
-        if not text:
-            return None
-
-        word_count = self._count_words(text)
         if not word_count:
             return None
 
@@ -334,50 +438,39 @@ class MetadataEnricher:
 
         return reading_time
 
-    def _extract_keywords(self, text: str, title: str = "") -> Optional[List[str]]:
+    @staticmethod
+    def _extract_keywords(text_lower: str, title: str = "") -> Optional[List[str]]:
         """
         Extract top keywords from text.
 
         Args:
-            text: Text content
+            text_lower: Lowercased text content
             title: Title (weighted more heavily)
 
         Returns:
             List of top keywords or None
         """
-        if not text or len(text) < 20:
+        if not text_lower or len(text_lower) < 20:
             return None
 
-        # Combine title (weighted 3x) and text
-        combined_text = (title + " ") * 3 + text
-
-        # Convert to lowercase and extract words
-        words = re.findall(r'\b[a-z]{3,}\b', combined_text.lower())
-
-        # Common stop words to filter out
-        stop_words = {
-            'the', 'and', 'for', 'that', 'with', 'this', 'from', 'are', 'was',
-            'but', 'not', 'you', 'all', 'can', 'her', 'has', 'had', 'our',
-            'out', 'one', 'two', 'more', 'than', 'been', 'have', 'will',
-            'what', 'when', 'who', 'which', 'their', 'said', 'each', 'about',
-            'how', 'other', 'into', 'after', 'also', 'some', 'these', 'only',
-            'then', 'now', 'may', 'such', 'very', 'over', 'just', 'where',
-            'most', 'both', 'through', 'way', 'could', 'before', 'does'
-        }
+        # Extract words from title (weighted 3x) and text
+        words = MetadataEnricher._WORD_RE.findall(title.lower()) * 3 + MetadataEnricher._WORD_RE.findall(text_lower)
 
-        # Filter stop words and count frequencies
-        filtered_words = [w for w in words if w not in stop_words]
+        # Count frequencies, then drop stop words from the (much smaller) counts
+        word_counts = Counter(words)
+        for stop_word in MetadataEnricher._STOP_WORDS:
+            word_counts.pop(stop_word, None)
 
-        if not filtered_words:
+        if not word_counts:
             return None
 
         # Get top keywords by frequency
-        word_counts = Counter(filtered_words)
         top_keywords = [word for word, _ in word_counts.most_common(10)]
 
         return top_keywords[:10] if top_keywords else None
 
-    def _detect_direct_answer(self, snippet: str, content: str, title: str) -> bool:
+    @staticmethod
+    def _detect_direct_answer(snippet: str, content: str, title: str) -> bool:
         """
         Detect if this result appears to be a direct answer.
 
@@ -392,25 +485,12 @@ class MetadataEnricher:
         # Check snippet and content for direct answer patterns
         text = (snippet + " " + content[:200]).lower()
 
-        # Direct answer indicators
-        direct_answer_patterns = [
-            r'^(yes|no)[,\.]',  # Starts with yes/no
-            r'^\d+',  # Starts with a number
-            r'(is|are|was|were)\s+\w+',  # Definition patterns
-            r'means\s+\w+',  # "X means..."
-            r'refers to',  # "X refers to..."
-            r'^the answer is',
-            r'^in short',
-            r'^simply put',
-            r'definition[:]\s*',
-        ]
-
-        for pattern in direct_answer_patterns:
-            if re.search(pattern, text):
-                return True
+        if MetadataEnricher._DIRECT_ANSWER_RE.search(text):
+            return True
 
         # Check if title is a question and content starts with answer
-        if '?' in title and any(content.strip().lower().startswith(word) for word in ['yes', 'no', 'the', 'it']):
+        # (only the first few characters matter, so only those are lowercased)
+        if '?' in title and content.lstrip()[:3].lower().startswith(('yes', 'no', 'the', 'it')):
             return True
 
         return False
@@ -2,11 +2,14 @@
 
 import httpx
 import asyncio
+import orjson
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 import logging
+import time
 
 from config import settings
+from services.http_client import get_http_client
+from services.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -14,15 +17,27 @@ logger = logging.getLogger(__name__)
 class SearXNGClient:
     """Async client for interacting with SearXNG."""
 
-    def __init__(self, base_url: str = None):
+    def __init__(self, base_url: str = None, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the SearXNG client.
 
         Args:
             base_url: Base URL for SearXNG (defaults to settings)
+            client: HTTP client to query SearXNG with (defaults to the shared client)
         """
         self.base_url = base_url or settings.searxng_url
         self.timeout = httpx.Timeout(30.0)
+        self._client = client
+        # Recent non-empty responses as serialized JSON (so each hit gets its
+        # own copy), keyed by the search parameters
+        self._cache = LRUCache(
+            settings.search_cache_max_entries, ttl=settings.search_cache_ttl_seconds
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for SearXNG requests."""
+        return self._client or get_http_client()
 
     async def search(
         self,
@@ -34,6 +49,9 @@ class SearXNGClient:
         """
         Perform a search query against SearXNG.
 
+        Responses with results are cached for a few minutes. On a cache hit,
+        search_time_ms is the time taken to serve it from the cache.
+
         Args:
             query: Search query string
             limit: Number of results to return
@@ -41,49 +59,64 @@ class SearXNGClient:
             language: Language code
 
         Returns:
-            Dict containing search results from SearXNG
+            Dict containing search results from SearXNG, with "results"
+            trimmed to at most ``limit`` entries. Callers should enrich only
+            these, not re-query for more.
 
         Raises:
             httpx.HTTPError: If request fails
         """
+        start_ns = time.monotonic_ns()
+
+        cache_key = (query, limit, engines, language)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            data = orjson.loads(cached)
+            data["search_time_ms"] = (time.monotonic_ns() - start_ns) // 1_000_000
+            return data
+
         params = {
             "q": query,
             "format": "json",
             "language": language,
+            # Only the first page is used; SearXNG has no per-request result count
+            "pageno": 1,
         }
 
         if engines:
             params["engines"] = engines
 
-        start_time = datetime.utcnow()
+        try:
+            response = await self.client.get(
+                f"{self.base_url}/search", params=params, timeout=self.timeout
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(f"{self.base_url}/search", params=params)
-                response.raise_for_status()
-                data = response.json()
+            # Calculate search time
+            search_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
 
-                # Calculate search time
-                search_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+            # Limit results (in place, before anything iterates over them)
+            if "results" in data:
+                del data["results"][limit:]
 
-                # Limit results
-                if "results" in data:
-                    data["results"] = data["results"][:limit]
+            if data.get("results"):
+                self._cache.set(cache_key, orjson.dumps(data))
 
-                # Add timing info
-                data["search_time_ms"] = int(search_time)
+            # Add timing info
+            data["search_time_ms"] = search_time_ms
 
-                return data
+            return data
 
-            except httpx.HTTPStatusError as e:
-                logger.error(f"SearXNG returned error: {e.response.status_code}")
-                raise
-            except httpx.RequestError as e:
-                logger.error(f"Failed to connect to SearXNG: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error during search: {e}")
-                raise
+        except httpx.HTTPStatusError as e:
+            logger.error(f"SearXNG returned error: {e.response.status_code}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"Failed to connect to SearXNG: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error during search: {e}")
+            raise
 
     async def health_check(self) -> bool:
         """
@@ -93,15 +126,17 @@ class SearXNGClient:
             True if healthy, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(5.0)) as client:
-                # Try to access the healthz endpoint or root
-                try:
-                    response = await client.get(f"{self.base_url}/healthz")
-                except httpx.HTTPStatusError:
-                    # Try root endpoint if healthz doesn't exist
-                    response = await client.get(f"{self.base_url}/")
-
-                return response.status_code == 200
+            timeout = httpx.Timeout(5.0)
+            # Only the status matters, so avoid downloading a body with HEAD
+            response = await self.client.head(f"{self.base_url}/healthz", timeout=timeout)
+            if response.status_code == 404:
+                # Try root endpoint if healthz doesn't exist
+                response = await self.client.head(f"{self.base_url}/", timeout=timeout)
+            if response.status_code == 405:
+                # HEAD not allowed; fall back to GET on the same endpoint
+                response = await self.client.get(response.request.url, timeout=timeout)
+
+            return response.is_success
         except Exception as e:
             logger.error(f"SearXNG health check failed: {e}")
             return False
@@ -114,13 +149,12 @@ class SearXNGClient:
             List of engine names
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # SearXNG's config endpoint
-                response = await client.get(f"{self.base_url}/config")
-                if response.status_code == 200:
-                    config = response.json()
-                    engines = config.get("engines", [])
-                    return [e["name"] for e in engines if not e.get("disabled", False)]
+            # SearXNG's config endpoint
+            response = await self.client.get(f"{self.base_url}/config", timeout=self.timeout)
+            if response.status_code == 200:
+                config = orjson.loads(response.content)
+                engines = config.get("engines", [])
+                return [e["name"] for e in engines if not e.get("disabled", False)]
         except Exception as e:
             logger.warning(f"Could not fetch engines list: {e}")
 
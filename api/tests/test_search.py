@@ -0,0 +1,50 @@
+"""Tests for the standard search endpoint."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import search
+
+
+RAW_RESULTS = [
+    {"url": "https://example.com/a", "title": "A", "content": "First result", "engine": "google"},
+    {"url": "https://example.com/b", "title": "B", "content": None, "engine": "bing"},
+    {"url": "https://example.com/c", "title": None, "content": "Third result", "engine": "brave"},
+]
+
+
+def _client(monkeypatch, raw_results):
+    async def fake_search(query, limit=10, engines=None, language="en"):
+        return {"results": list(raw_results), "search_time_ms": 5}
+
+    async def fake_batch_extract(urls, timeout=None):
+        return {}
+
+    monkeypatch.setattr(search.searxng_client, "search", fake_search)
+    monkeypatch.setattr(search.content_extractor, "batch_extract", fake_batch_extract)
+
+    app = FastAPI()
+    app.include_router(search.router)
+    return TestClient(app)
+
+
+def test_result_with_null_content_does_not_fail_search(monkeypatch):
+    client = _client(monkeypatch, RAW_RESULTS)
+
+    response = client.get("/api/v1/search", params={"q": "test", "limit": 3})
+
+    assert response.status_code == 200
+    urls = {result["url"] for result in response.json()["results"]}
+    assert {"https://example.com/a", "https://example.com/c"} <= urls
+
+
+def test_unresolvable_result_is_dropped_individually(monkeypatch):
+    # A non-string snippet can't be sliced, so this result fails to resolve
+    broken = {"url": "https://example.com/broken", "title": 42, "content": 7}
+    client = _client(monkeypatch, [RAW_RESULTS[0], broken, RAW_RESULTS[2]])
+
+    response = client.get("/api/v1/search", params={"q": "test", "limit": 3})
+
+    assert response.status_code == 200
+    urls = [result["url"] for result in response.json()["results"]]
+    assert urls == ["https://example.com/a", "https://example.com/c"]
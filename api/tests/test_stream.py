@@ -0,0 +1,53 @@
+"""Tests for the streaming search endpoint."""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config import settings
+from routers import stream
+from services.content_extractor import ContentExtractor
+
+
+def test_stream_ends_within_deadline_behind_throttled_host(monkeypatch):
+    monkeypatch.setattr(settings, "extract_timeout_seconds", 1)
+
+    async def throttled(request):
+        await asyncio.sleep(0.4)
+        return httpx.Response(429)
+
+    extractor = ContentExtractor(client=httpx.AsyncClient(transport=httpx.MockTransport(throttled)))
+    # The host has already been backed off to a single permit, so ten pages
+    # would take ~4s if every fetch were waited for
+    extractor._host_limiter("https://throttled.example/").limit = 1
+    monkeypatch.setattr(stream, "content_extractor", extractor)
+
+    async def fake_search(query, limit=10, engines=None, language="en"):
+        return {
+            "results": [
+                {"url": f"https://throttled.example/{i}", "title": f"Page {i}",
+                 "content": f"Snippet {i}", "engine": "google"}
+                for i in range(10)
+            ],
+            "search_time_ms": 5,
+        }
+
+    monkeypatch.setattr(stream.searxng_client, "search", fake_search)
+
+    app = FastAPI()
+    app.include_router(stream.router)
+    client = TestClient(app)
+
+    started = time.monotonic()
+    response = client.get("/api/v1/search/stream", params={"q": "test", "limit": 10})
+    elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    assert elapsed < 2.5
+    body = response.text
+    assert body.count("event: result") == 10
+    assert "Snippet 9" in body
+    assert body.rstrip().endswith('data: {"status":"complete"}')